@@ -2,6 +2,8 @@
 
 import tkinter as tk
 import math
+from collections import Counter
+from itertools import pairwise
 import geometry as gm
 import drawing as drw
 from state import LayerState
@@ -13,7 +15,7 @@ from state import LayerState
 # --------------------------------------------------------
 
 # Precompute tan(60°) = √3
-TAN45 = 1
+SQRT3 = math.sqrt(3.0)
 
 class CanvasManager:
     """
@@ -41,9 +43,46 @@ class CanvasManager:
         self.layers_3d = []
         self.triangles_3d = []
 
+        # Per-layer record kept so undo/redo never recompute a layer:
+        #   layer tag → (row3d, faces, branches after the layer was built,
+        #                2D bounding box of the layer's points)
+        self._layer_cache = {}
+
+        # Per-layer dot images: canvas item → (PhotoImage, points, colour).
+        # Holding the PhotoImage here keeps Tk from discarding it.
+        self.dot_sprites = {}
+        # Layers built while dots were hidden: (tag, points, colour) to paint
+        # once the dot channel is shown again
+        self._pending_dots = []
+
+        # Hull bookkeeping, kept up to date as layers come and go instead of
+        # rescanning every 'tri' item: undirected edge → number of triangles
+        # using it, and layer tag → the edges that layer contributed
+        self._edge_cnt = Counter()
+        self._layer_edges = {}
+
+        # Last state applied per visibility channel ('dot','row','tri','hull')
+        self._vis = {}
+        # Line width last applied to existing items (new ones are created
+        # with the current spinbox value)
+        self._thickness = line_thickness_var.get()
+
         # Helpers for dragging seed points
         self._drag_i = None
         self._drag_id = None
+        # The seed line: one polyline item through all seed dots, once there
+        # are two of them
+        self._seed_line = None
+        # Hull polyline items, one per boundary loop, reused across refreshes
+        self._hull_lines = []
+        # Set when update_hull was skipped because the hull is hidden
+        self._hull_dirty = False
+        # Pending after_idle id of a coalesced drag redraw, if any, and the
+        # latest (dot item, x, y) it should apply
+        self._drag_after = None
+        self._drag_latest = None
+        # Pending after_idle id of a coalesced scrollregion refresh, if any
+        self._scroll_after = None
 
         # Bind mouse events
         self.cv.bind('<Button-1>', self.on_click)
@@ -62,67 +101,118 @@ class CanvasManager:
         if self.state.seed_locked:
             return
 
-        x = self.cv.canvasx(event.x)
-        y = self.cv.canvasy(event.y)
+        cv = self.cv
+        x = cv.canvasx(event.x)
+        y = cv.canvasy(event.y)
 
         if not self.state.rows:
             # First time: create the seed row
             self.state.rows.append([])
+        seeds = self.state.rows[0]
 
         # Hit‐test any existing seed dot (within 3×DOT_R)
-        for i, (px, py) in enumerate(self.state.rows[0]):
-            if (x - px)**2 + (y - py)**2 <= (drw.DOT_R * 3)**2:
+        for i, (px, py) in enumerate(seeds):
+            dx, dy = x - px, y - py
+            if dx*dx + dy*dy <= drw.HIT_R2:
                 self._drag_i = i
-                self._drag_id = self.cv.find_closest(px, py)[0]
+                self._drag_id = cv.find_closest(px, py)[0]
                 return
 
         # Otherwise, add a brand‐new seed dot
-        self.state.rows[0].append((x, y))
-        drw.draw_point(self.cv, x, y, 'black', 'seed')
-
-        # If more than one seed, draw the seed‐line to the previous seed
-        if len(self.state.rows[0]) > 1:
-            p, q = self.state.rows[0][-2], self.state.rows[0][-1]
-            self.cv.create_line(
-                p[0], p[1], q[0], q[1],
+        seeds.append((x, y))
+        drw.draw_point(cv, x, y, 'black', 'seed')
+
+        # If more than one seed, extend the seed‐line to the new seed
+        if self._seed_line is not None:
+            cv.coords(self._seed_line, *drw.flatten(seeds))
+        elif len(seeds) > 1:
+            self._seed_line = cv.create_line(
+                *drw.flatten(seeds),
                 tags=('seed','row'),
                 width=self.line_thickness_var.get()
             )
 
-        # Recompute the silhouette (outer hull) whenever the seed row changes
-        self.update_hull()
+        # Seeds are only editable before the first layer, so there are no
+        # triangles and the silhouette cannot change; just let the canvas
+        # scroll to the new dot
+        self._schedule_scrollregion()
 
 
     def on_drag(self, event):
         """
-        If dragging a seed dot, update its position, redraw the entire seed‐line,
-        then recalc the silhouette.
+        If dragging a seed dot, record its new position. Motion events arrive
+        far faster than the screen redraws, so the canvas update is coalesced
+        into one after_idle call that applies only the latest position.
+        Seed edits cannot change the triangle silhouette, so no hull work is done.
         """
         if self._drag_i is None:
             return
 
-        x = self.cv.canvasx(event.x)
-        y = self.cv.canvasy(event.y)
+        cv = self.cv
+        x = cv.canvasx(event.x)
+        y = cv.canvasy(event.y)
         self.state.rows[0][self._drag_i] = (x, y)
 
+        # the dot item is kept too: on_release may clear _drag_id first
+        self._drag_latest = (self._drag_id, x, y)
+        if self._drag_after is None:
+            self._drag_after = cv.after_idle(self._apply_drag)
+
+
+    def _apply_drag(self):
+        """
+        Redraw the drag coalesced by on_drag: move the oval to the latest
+        position, reshape the seed‐line with a single coords call and refresh
+        the scrollregion.
+        """
+        self._drag_after = None
+        cv = self.cv
+        r = drw.DOT_R
+        item, x, y = self._drag_latest
+
         # Move the oval under the cursor
-        self.cv.coords(
-            self._drag_id,
-            x - drw.DOT_R, y - drw.DOT_R,
-            x + drw.DOT_R, y + drw.DOT_R
-        )
-
-        # Redraw the “seed line” by connecting all seed dots in row 0
-        self.cv.delete('seed_line')
-        for i in range(len(self.state.rows[0]) - 1):
-            p, q = self.state.rows[0][i], self.state.rows[0][i+1]
-            self.cv.create_line(
-                p[0], p[1], q[0], q[1],
-                tags=('seed_line','row'),
-                width=self.line_thickness_var.get()
-            )
+        cv.coords(item, x - r, y - r, x + r, y + r)
 
-        self.update_hull()
+        # Reshape the seed‐line through the moved dot
+        if self._seed_line is not None:
+            cv.coords(self._seed_line, *drw.flatten(self.state.rows[0]))
+
+        self._update_scrollregion()
+
+
+    def _schedule_scrollregion(self):
+        """
+        Ask for a scrollregion refresh once Tk is idle. Clicks, layer changes
+        and hull rebuilds arriving before then share a single refresh.
+        """
+        if self._scroll_after is None:
+            self._scroll_after = self.cv.after_idle(self._idle_scrollregion)
+
+
+    def _idle_scrollregion(self):
+        self._scroll_after = None
+        self._update_scrollregion()
+
+
+    def _update_scrollregion(self):
+        """
+        Let the canvas pan over everything drawn. The extent is the union of
+        the seed row's box and the cached boxes of the live layers, instead of
+        cv.bbox('all'), which makes Tk walk every canvas item.
+        """
+        boxes = [self._layer_cache[t][3] for t in self.state.tags]
+        boxes = [b for b in boxes if b is not None]
+        if self.state.rows and self.state.rows[0]:
+            boxes.append(gm.points_bbox(self.state.rows[0]))
+        if not boxes:
+            self.cv.configure(scrollregion=(0, 0, 1000, 700))
+            return
+        # room for the dots and line ends around the outermost points
+        pad = drw.DOT_R + self.line_thickness_var.get()
+        self.cv.configure(scrollregion=(
+            min(b[0] for b in boxes) - pad, min(b[1] for b in boxes) - pad,
+            max(b[2] for b in boxes) + pad, max(b[3] for b in boxes) + pad
+        ))
 
 
     def on_release(self, _):
@@ -139,11 +229,22 @@ class CanvasManager:
            child_z = parent_z ± (L * √3),
         where L = distance(p2d, c2d). LEFT → negative Z, RIGHT → positive Z.
         """
+        if self._build_layer(side_var):
+            self.update_hull()
+            self._reapply_visibility()
 
+
+    def _build_layer(self, side_var: tk.StringVar):
+        """
+        Compute, draw and record one new layer without refreshing the hull or
+        visibility, so callers adding many layers can refresh once at the end.
+        Returns False if the last row is too short to grow.
+        """
         if not self.state.rows or len(self.state.rows[-1]) < 2:
-            return
+            return False
 
         self.state.seed_locked = True
+        self._discard_redo()
         idx = len(self.state.tags)
         tag = f'ly{idx}'
         colour = drw.layer_colour(idx)
@@ -157,6 +258,7 @@ class CanvasManager:
 
         parent2d = self.state.rows[-1]
         parent3d = self.layers_3d[-1]
+        n_faces = len(self.triangles_3d)
 
         if side_var.get() == 'BOTH':
             # In BOTH mode, we clone the entire parent row into two branches.
@@ -185,19 +287,113 @@ class CanvasManager:
 
             new2d = l2d + r2d
             new3d = l3d + r3d
+            seam = len(l2d)
 
         else:
             sign = +1 if side_var.get() == 'LEFT' else -1
+            self._draw_seam(parent2d, tag, w)
             new2d, new3d = self._make_next(parent2d, parent3d, sign, tag, colour, w)
             self.state.left_branch = self.state.right_branch = None
             self.state.left3d = self.state.right3d = None
+            seam = None
 
         # Push new2d into 2D state and new3d into layers_3d
-        self.state.push(new2d, tag)
+        self.state.push(new2d, tag, seam)
         self.layers_3d.append(new3d)
+        # an empty row (both BOTH branches used up) has no extent
+        bbox = gm.points_bbox(new2d) if new2d else None
+        self._layer_cache[tag] = (new3d, self.triangles_3d[n_faces:],
+                                  self._branches(), bbox)
+        return True
+
+
+    def _branches(self):
+        """Snapshot of the BOTH-mode branch rows (2D and 3D)."""
+        st = self.state
+        return st.left_branch, st.right_branch, st.left3d, st.right3d
+
+
+    def _set_branches(self, branches):
+        st = self.state
+        st.left_branch, st.right_branch, st.left3d, st.right3d = branches
+
+
+    def _draw_seam(self, parent2d, tag, width):
+        """
+        Parent-row edges are not redrawn by _make_next: they already exist as
+        the previous layer's row line. The one exception is a row produced in
+        BOTH mode, whose two branch lines never join; draw that seam edge.
+        """
+        seam = self.state.seams[-1] if self.state.seams else None
+        if seam:
+            a, b = parent2d[seam-1], parent2d[seam]
+            self.cv.create_line(a[0], a[1], b[0], b[1],
+                                tags=(tag, 'row'), width=width)
+
+
+    def _count_edges(self, tag, parent2d, children2d):
+        """
+        Add the 'tri' edges of one row (the zig-zag p₀ c₀ p₁ c₁ … pₙ; parent
+        edges are 'row' lines) to the hull edge counts. Points are snapped to
+        whole pixels, as the canvas shows them, so edges shared by neighbouring
+        triangles get identical keys; vertices and edges are packed into ints
+        (see geometry.vertex_key and edge_key) so hashing a key is a single
+        int hash.
+        The keys are counted by Counter.update, which runs in C.
+        """
+        snap = [gm.vertex_key(x, y) for x, y in parent2d]
+        tips = [gm.vertex_key(x, y) for x, y in children2d]
+        edge_key = gm.edge_key
+        keys = [edge_key(a, b)
+                for (p, q), c in zip(pairwise(snap), tips)
+                for a, b in ((p, c), (c, q))]
+        self._layer_edges.setdefault(tag, []).extend(keys)
+        self._edge_cnt.update(keys)
+
+
+    def _uncount_edges(self, tag):
+        """Drop one layer's edges from the hull edge counts (kept for redo)."""
+        cnt = self._edge_cnt
+        for key in self._layer_edges.get(tag, ()):
+            if cnt[key] == 1:
+                del cnt[key]
+            else:
+                cnt[key] -= 1
 
-        self.update_hull()
-        self.update_visibility()
+
+    def _recount_edges(self, tag):
+        """Add a redone layer's recorded edges back to the hull edge counts."""
+        self._edge_cnt.update(self._layer_edges.get(tag, ()))
+
+
+    def _draw_dots(self, tag, pts, colour):
+        """
+        Paint one layer's dots as a single sprite and keep it registered.
+        Returns the sprite item, or None for an empty row (no sprite).
+        """
+        if not pts:
+            return None
+        item, img = drw.draw_points(self.cv, pts, colour, tag)
+        self.dot_sprites[item] = (img, pts, colour)
+        return item
+
+
+    def _discard_redo(self):
+        """
+        A new layer kills the redo branch: delete the hidden canvas items of
+        every undone layer, so their tags can be reused by the new layers.
+        """
+        if not self.state.redo:
+            return
+        for t in self.state.undone:
+            for item in self.cv.find_withtag(t):
+                self.dot_sprites.pop(item, None)
+            self.cv.delete(t)
+            self._layer_cache.pop(t, None)
+            self._layer_edges.pop(t, None)
+        self._pending_dots = [d for d in self._pending_dots
+                              if d[0] not in self.state.undone]
+        self.state.undone.clear()
 
 
     def _make_next(self, parent2d, parent3d, side, tag, colour, width):
@@ -206,8 +402,8 @@ class CanvasManager:
           parent2d =     [(x₁,y₁), (x₂,y₂), …, (xₙ,yₙ)]        length = n
           parent3d =     [(x₁,y₁,z₁), (x₂,y₂,z₂), …, (xₙ,yₙ,zₙ)]  length = n
         Build n−1 children as follows:
-          1) Compute c2d = third_vertex(p2d, q2d, side).
-          2) Draw the 2D triangle on the canvas.
+          1) Compute every c2d with geometry.third_vertices in one pass.
+          2) Draw the 2D triangles on the canvas (one zig-zag polyline).
           3) Compute L = distance(p2d, c2d).
           4) If side=+1 (LEFT):  c_z = p3d.z − (L * √3)
              If side=−1 (RIGHT): c_z = p3d.z + (L * √3)
@@ -220,45 +416,41 @@ class CanvasManager:
           children2d = [c2d₁, c2d₂, …]   length = (n−1)
           children3d = [c3d₁, c3d₂, …]   length = (n−1)
         """
-        children2d = []
+        # All children of the row in one pass, then draw/record per triangle
+        children2d = gm.third_vertices(parent2d, side)
         children3d = []
 
-        for i in range(len(parent2d) - 1):
-            p2d = parent2d[i]
-            q2d = parent2d[i+1]
-            p3d = parent3d[i]
-            q3d = parent3d[i+1]
-
-            c2d = gm.third_vertex(p2d, q2d, side)
-            children2d.append(c2d)
-
-            # Draw the 2D equilateral triangle
-            drw.draw_triangle(self.cv, p2d, q2d, c2d, tag, colour, width)
-
+        # Draw all 2D equilateral triangles of the row in a few batched items
+        drw.draw_triangles(self.cv, parent2d, children2d, tag, colour, width)
+        self._count_edges(tag, parent2d, children2d)
+        if self._vis.get('dot') == 'hidden':
+            self._pending_dots.append((tag, children2d, colour))
+        else:
+            self._draw_dots(tag, children2d, colour)
+
+        # Bind the hot names once so the loop runs on fast locals instead of
+        # re-resolving self./module attributes per triangle.
+        hypot = math.hypot
+        add_tri = self.triangles_3d.append
+        add_child = children3d.append
+        # Δz = L * √3 at exactly 60°; side = +1 (LEFT) ⇒ negative Z,
+        # side = −1 (RIGHT) ⇒ positive Z
+        slope = -side * SQRT3
+
+        for p2d, c2d, (p3d, q3d) in zip(parent2d, children2d,
+                                        pairwise(parent3d)):
             # Compute horizontal distance L = dist(p2d, c2d)
-            dx = c2d[0] - p2d[0]
-            dy = c2d[1] - p2d[1]
-            L = math.hypot(dx, dy)
-
-            # Compute c_z at exactly 60°: Δz = L * √3
-            if side == +1:
-                # LEFT ⇒ negative Z
-                c_z = p3d[2] - (L * TAN45)
-            else:
-                # RIGHT ⇒ positive Z
-                c_z = p3d[2] + (L * TAN45)
-
-            c3d = (c2d[0], c2d[1], c_z)
+            L = hypot(c2d[0] - p2d[0], c2d[1] - p2d[1])
+            c3d = (c2d[0], c2d[1], p3d[2] + L * slope)
 
             # Record the 3D slanted face
-            self.triangles_3d.append((p3d, q3d, c3d))
-            children3d.append(c3d)
+            add_tri((p3d, q3d, c3d))
+            add_child(c3d)
 
-        # Draw the 2D “row‐line” connecting consecutive c2d’s
-        for i in range(len(children2d) - 1):
-            a, b = children2d[i], children2d[i+1]
+        # Draw the 2D “row‐line” connecting consecutive c2d’s as one polyline
+        if len(children2d) > 1:
             self.cv.create_line(
-                a[0], a[1], b[0], b[1],
+                *drw.flatten(children2d),
                 tags=(tag, 'row'),
                 width=width
             )
@@ -268,93 +460,80 @@ class CanvasManager:
 
     def undo_layer(self):
         """
-        Hide & pop the last 2D layer via state.pop(), then pop the last 3D row.
-        Remove any triangles whose apex z is in that popped 3D row.
+        Hide & pop the last 2D layer via state.pop(), then pop its 3D row and
+        faces off the tails of layers_3d / triangles_3d. The layer's canvas
+        items and cached geometry are kept so redo can bring it straight back.
         """
         tag = self.state.pop()
         if not tag:
             return
 
         self.cv.itemconfigure(tag, state='hidden')
+        self.cv.addtag_withtag('undone', tag)
         self.state.undone.add(tag)
-
-        if self.layers_3d:
-            popped3d = self.layers_3d.pop()
-            zvals = {z for (_, _, z) in popped3d}
-            self.triangles_3d = [
-                tri for tri in self.triangles_3d
-                if tri[2][2] not in zvals
-            ]
+        self._uncount_edges(tag)
+
+        faces = self._layer_cache[tag][1]
+        self.layers_3d.pop()
+        if faces:
+            del self.triangles_3d[-len(faces):]
+        if len(self.layers_3d) == 1:
+            # Back at the seed, which may be edited again: rebuild its 3D
+            # copy on the next add_layer()
+            self.layers_3d.clear()
+
+        # Branches as they were right after the previous layer was built
+        prev = self.state.tags[-1] if self.state.tags else None
+        if prev in self._layer_cache:
+            self._set_branches(self._layer_cache[prev][2])
+        else:
+            self._set_branches((None, None, None, None))
 
         self.update_hull()
-        self.update_visibility()
+        self._reapply_visibility()
 
 
-    def redo_layer(self, side_var: tk.StringVar):
+    def redo_layer(self):
         """
-        Un-hide the most recently undone 2D layer, then rebuild its 3D triangles
-        exactly as in add_layer(), preserving shared vertices so the mesh remains
-        fully interconnected.
+        Un-hide the most recently undone 2D layer and restore its cached 3D row,
+        faces, hull edges and BOTH-mode branches. Nothing is recomputed or
+        redrawn, so the mesh is exactly the one built originally.
         """
         tag = self.state.redo_layer()
         if not tag:
             return
 
         self.state.undone.discard(tag)
+        self.cv.dtag(tag, 'undone')
         self.cv.itemconfigure(tag, state='normal')
 
-        idx = len(self.state.tags) - 1
-        colour = drw.layer_colour(idx)
-        w = self.line_thickness_var.get()
-
-        # The “parent row” (2D & 3D) is one level back
-        parent2d = self.state.rows[-2]
-        parent3d = self.layers_3d[-1]
-
-        if side_var.get() == 'BOTH':
-            # Restore BOTH logic by cloning the entire parent row into two branches
-            if self.state.left_branch is None:
-                self.state.left_branch  = list(parent2d)
-                self.state.right_branch = list(parent2d)
-                self.state.left3d       = list(parent3d)
-                self.state.right3d      = list(parent3d)
-
-            l2d, l3d = self._make_next(
-                self.state.left_branch, self.state.left3d,
-                +1, tag, colour, w
-            )
-            r2d, r3d = self._make_next(
-                self.state.right_branch, self.state.right3d,
-                -1, tag, colour, w
-            )
-            self.state.left_branch  = l2d
-            self.state.right_branch = r2d
-            self.state.left3d       = l3d
-            self.state.right3d      = r3d
-
-            new2d = l2d + r2d
-            new3d = l3d + r3d
-
-        else:
-            sign = +1 if side_var.get() == 'LEFT' else -1
-            new2d, new3d = self._make_next(parent2d, parent3d, sign, tag, colour, w)
-            self.state.left_branch = self.state.right_branch = None
-            self.state.left3d = self.state.right3d = None
+        row3d, faces, branches, _ = self._layer_cache[tag]
+        if not self.layers_3d:
+            self.layers_3d.append([(x, y, 0.0) for (x, y) in self.state.rows[0]])
+        self.layers_3d.append(row3d)
+        self.triangles_3d.extend(faces)
+        self._recount_edges(tag)
+        self._set_branches(branches)
 
-        self.layers_3d.append(new3d)
         self.update_hull()
-        self.update_visibility()
+        self._reapply_visibility()
 
 
     def auto_run(self, side_var: tk.StringVar):
         """
         Keep adding layers until the last row has ≤ 2 points.
         Skip if side_var='BOTH'.
+        All layers are built first; the hull (a full scan of every triangle)
+        and visibility are refreshed once at the end instead of per layer.
         """
         if side_var.get() == 'BOTH':
             return
+        built = False
         while self.state.rows and len(self.state.rows[-1]) > 2:
-            self.add_layer(side_var)
+            built = self._build_layer(side_var) or built
+        if built:
+            self.update_hull()
+            self._reapply_visibility()
 
 
     def clear(self):
@@ -363,9 +542,16 @@ class CanvasManager:
         and reset scrollregion to (0,0,1000,700).
         """
         self.cv.delete('all')
+        self._seed_line = None
+        self._hull_lines.clear()
         self.state = LayerState()
         self.layers_3d.clear()
         self.triangles_3d.clear()
+        self.dot_sprites.clear()
+        self._pending_dots.clear()
+        self._edge_cnt.clear()
+        self._layer_edges.clear()
+        self._layer_cache.clear()
         self.cv.configure(scrollregion=(0, 0, 1000, 700))
         self.update_hull()
 
@@ -376,98 +562,187 @@ class CanvasManager:
         Show/hide canvas items based on:
           • self.v_dots, self.v_rows, self.v_tris, self.v_hull
           • any layer tags in self.state.undone
+        New items are created visible, so a channel that is shown and was
+        already shown last time needs no itemconfigure. Hidden channels are
+        always re-applied so freshly drawn items get hidden too, and undone
+        layers only need re-hiding after some channel was switched back on;
+        they all carry the shared 'undone' tag, so that is a single call.
+        Dots skipped while the dot channel was off are painted, and a hull
+        skipped while the hull was off is rebuilt, when the channel is
+        switched back on.
         """
-        self.cv.itemconfigure('dot',  state=('normal' if self.v_dots.get() else 'hidden'))
-        self.cv.itemconfigure('row',  state=('normal' if self.v_rows.get() else 'hidden'))
-        self.cv.itemconfigure('tri',  state=('normal' if self.v_tris.get() else 'hidden'))
-        self.cv.itemconfigure('hull', state=('normal' if self.v_hull.get() else 'hidden'))
+        revealed = False
+        for tag, var in (('dot',  self.v_dots),
+                         ('row',  self.v_rows),
+                         ('tri',  self.v_tris),
+                         ('hull', self.v_hull)):
+            state = 'normal' if var.get() else 'hidden'
+            if state == 'normal' and self._vis.get(tag) == 'normal':
+                continue
+            if tag == 'dot' and state == 'normal':
+                # paint the dots of layers built while dots were hidden
+                for t, pts, colour in self._pending_dots:
+                    item = self._draw_dots(t, pts, colour)
+                    # a layer undone while its dots were queued was tagged
+                    # before this sprite existed; tag it too, so the re-hide
+                    # below and visible_items() treat it as undone
+                    if item is not None and t in self.state.undone:
+                        self.cv.addtag_withtag('undone', item)
+                self._pending_dots.clear()
+            self._vis[tag] = state
+            if tag == 'hull' and state == 'normal' and self._hull_dirty:
+                self.update_hull()
+            self.cv.itemconfigure(tag, state=state)
+            revealed = revealed or state == 'normal'
+
+        if revealed and self.state.undone:
+            self.cv.itemconfigure('undone', state='hidden')
+
+
+    def _reapply_visibility(self):
+        """
+        Hot-path refresh after add/undo/redo/hull: re-hide freshly drawn items
+        on channels that update_visibility last hid. The checkboxes are the
+        only way a channel changes and they call update_visibility, so no
+        IntVar.get() round-trips are needed here.
+        """
+        if len(self._vis) < 4:
+            self.update_visibility()
+            return
+        for tag, state in self._vis.items():
+            if state == 'hidden':
+                self.cv.itemconfigure(tag, state='hidden')
 
-        for t in self.state.undone:
-            self.cv.itemconfigure(t, state='hidden')
+
+    def visible_items(self):
+        """
+        Ids of every item currently shown, from one tag-expression query
+        instead of an itemcget(state) per item: undone layers carry 'undone'
+        and hidden channels are excluded by their tag.
+        """
+        terms = ['!undone']
+        terms += ['!' + tag for tag, state in self._vis.items() if state == 'hidden']
+        return self.cv.find_withtag('&&'.join(terms))
 
 
     def update_thickness(self):
         """
         Set every line tagged 'row', 'tri', or 'hull' to have width = spinbox value.
+        Nothing is touched when the value did not change, and the three tags
+        are matched by one tag expression, so Tk walks the items only once.
         """
         w = self.line_thickness_var.get()
-        for tag in ('row', 'tri', 'hull'):
-            self.cv.itemconfigure(tag, width=w)
+        if w == self._thickness:
+            return
+        self._thickness = w
+        self.cv.itemconfigure('row||tri||hull', width=w)
 
 
     # ---------------------- True Outer‐Hull Silhouette ----------------------
     def update_hull(self):
         """
         Recompute the 2D boundary by:
-          1) Counting each undirected edge among 'tri' lines,
+          1) Taking the undirected edge counts of the visible triangles
+             (maintained per layer by _count_edges / _uncount_edges),
           2) Keeping edges that appear exactly once,
           3) Building adjacency: vertex → [neighbors],
           4) Walking each closed loop,
           5) Drawing the loops as 'hull' lines,
-          6) Updating scrollregion so the canvas can pan to show all content.
+          6) Scheduling a scrollregion refresh so the canvas can pan to show
+             all content.
+        While the hull channel is switched off, steps 1–5 are skipped and the
+        hull is rebuilt by update_visibility once it is shown again.
         """
-        cv = self.cv
-        cv.delete('hull')
+        if self._vis.get('hull') == 'hidden':
+            self._hull_dirty = True
+            self._schedule_scrollregion()
+            return
+        self._hull_dirty = False
 
-        # 1) Count undirected occurrences of each 'tri' edge
-        edge_cnt = {}
-        for item in cv.find_withtag('tri'):
-            coords = list(map(int, map(round, cv.coords(item))))
-            p = (coords[0], coords[1])
-            q = (coords[2], coords[3])
-            key = tuple(sorted((p, q)))
-            edge_cnt[key] = edge_cnt.get(key, 0) + 1
+        # 1) Edge counts are already up to date; no canvas scan needed
+        edge_cnt = self._edge_cnt
 
         # 2) Keep only edges that appear exactly once ⇒ boundary edges
         boundary = [e for e, cnt in edge_cnt.items() if cnt == 1]
         if len(boundary) < 3:
+            self._draw_hull([])
             # Even if no hull loops, update scrollregion so panning works
-            self.cv.configure(scrollregion=self.cv.bbox('all') or (0, 0, 1000, 700))
-            self.update_visibility()
+            self._schedule_scrollregion()
+            self._reapply_visibility()
             return
 
-        # 3) Build adjacency: vertex → [neighbors]
-        adj = {}
-        for p, q in boundary:
-            adj.setdefault(p, []).append(q)
-            adj.setdefault(q, []).append(p)
-
-        # 4) Walk each closed loop using a visited-edge set
-        visited = set()
+        # 3) Build adjacency on integer ids: each boundary vertex gets an id,
+        #    and nbrs[id] lists its (neighbour id, edge id) pairs, so the walk
+        #    below marks edges in a flat list instead of hashing point pairs
+        vid = {}
+        pts = []
+        nbrs = []
+        for eid, e in enumerate(boundary):
+            p, q = gm.edge_ends(e)
+            for v in (p, q):
+                if v not in vid:
+                    vid[v] = len(pts)
+                    pts.append(v)
+                    nbrs.append([])
+            i, j = vid[p], vid[q]
+            nbrs[i].append((j, eid))
+            nbrs[j].append((i, eid))
+
+        # 4) Walk each closed loop, marking edges as used
+        used = [False] * len(boundary)
         loops = []
-        for start in adj:
-            if all(tuple(sorted((start, n))) in visited for n in adj[start]):
+        for start in range(len(pts)):
+            if all(used[e] for _, e in nbrs[start]):
                 continue
 
             loop = [start]
-            prev, curr = None, start
+            curr = start
             while True:
                 nxt = None
-                for n in adj[curr]:
-                    key = tuple(sorted((curr, n)))
-                    if key not in visited:
+                for n, e in nbrs[curr]:
+                    if not used[e]:
+                        used[e] = True
                         nxt = n
-                        visited.add(key)
                         break
                 if nxt is None or nxt == start:
                     break
                 loop.append(nxt)
-                prev, curr = curr, nxt
+                curr = nxt
 
-            if len(loop) > 2:
+            # Only close chains that really return to their start; an open
+            # chain must not get a fake closing edge.
+            if nxt == start:
                 loop.append(start)
-                loops.append(loop)
+            if len(loop) > 2:
+                loops.append([gm.vertex_point(pts[i]) for i in loop])
 
         # 5) Draw each boundary loop as a continuous hull line
-        w = self.line_thickness_var.get()
-        for loop in loops:
-            for i in range(len(loop) - 1):
-                p, q = loop[i], loop[i+1]
-                cv.create_line(
-                    p[0], p[1], q[0], q[1],
-                    tags=('hull',), width=w
-                )
+        self._draw_hull(loops)
 
         # 6) Update scrollregion so user can pan/zoom to see all content
-        self.cv.configure(scrollregion=self.cv.bbox('all') or (0, 0, 1500, 1500))
-        self.update_visibility()
+        self._schedule_scrollregion()
+        self._reapply_visibility()
+
+
+    def _draw_hull(self, loops):
+        """
+        Show each boundary loop as one 'hull' polyline. Existing hull items are
+        moved with cv.coords and only the surplus is created or deleted, rather
+        than recreating one line item per hull edge on every refresh.
+        """
+        cv = self.cv
+        items = self._hull_lines
+        for item in items[len(loops):]:
+            cv.delete(item)
+        del items[len(loops):]
+
+        w = None
+        for k, loop in enumerate(loops):
+            flat = drw.flatten(loop)
+            if k < len(items):
+                cv.coords(items[k], *flat)
+            else:
+                if w is None:
+                    # only new items need the width (IntVar.get is a Tcl call)
+                    w = self.line_thickness_var.get()
+                items.append(cv.create_line(*flat, tags=('hull',), width=w))
@@ -90,7 +90,7 @@ class TriGrowthController:
         self.canvas_mgr.undo_layer()
 
     def canvas_mgr_redo(self):
-        self.canvas_mgr.redo_layer(self.side_var)
+        self.canvas_mgr.redo_layer()
 
     def canvas_mgr_update_visibility(self):
         self.canvas_mgr.update_visibility()
@@ -114,8 +114,12 @@ class TriGrowthController:
             return
 
         if fmt == 'svg':
-            exporter.export_svg(self.canvas, self.line_thickness_var, path)
+            exporter.export_svg(self.canvas, self.line_thickness_var, path,
+                                self.canvas_mgr.dot_sprites,
+                                self.canvas_mgr.visible_items())
         elif fmt == 'png':
-            exporter.export_png(self.canvas, path)
+            exporter.export_png(self.canvas, self.line_thickness_var, path,
+                                self.canvas_mgr.dot_sprites,
+                                self.canvas_mgr.visible_items())
         else:  # 'obj'
-            exporter.export_obj(self.canvas_mgr.triangles_3d, path)
+            exporter.export_obj(self.canvas_mgr, path)
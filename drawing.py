@@ -1,24 +1,74 @@
 import colorsys
 import tkinter as tk
+from itertools import chain
 
 DOT_R = 3
+# Seed hit-test radius (3×DOT_R), squared so the test needs no sqrt
+HIT_R2 = (DOT_R * 3) ** 2
 
-def layer_colour(i):
+# A dot of radius DOT_R painted as a few filled rectangles (half-width,
+# half-height) whose union approximates the disc.
+_DOT_RECTS = []
+for _h in range(DOT_R, -1, -1):
+    _w = round((DOT_R**2 - _h**2) ** 0.5)
+    if not _DOT_RECTS or _w > _DOT_RECTS[-1][0]:
+        _DOT_RECTS.append((_w, _h))
+
+def _hue_colour(i):
     h = (i * 0.15) % 1
     r, g, b = colorsys.hsv_to_rgb(h, 0.9, 0.95)
     return f'#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}'
 
+# The hue steps by 0.15 per layer, so colours repeat every 20 layers;
+# build that palette once instead of converting HSV→hex per layer.
+_PALETTE = tuple(_hue_colour(i) for i in range(20))
+
+def layer_colour(i):
+    return _PALETTE[i % len(_PALETTE)]
+
 def draw_point(cv: tk.Canvas, x, y, colour, tag):
     r = DOT_R
     cv.create_oval(x-r, y-r, x+r, y+r,
                    fill=colour, outline='', tags=(tag, 'dot'))
 
-def draw_triangle(cv: tk.Canvas, p, q, r, tag, colour, width):
-    # now passing width into every edge
-    cv.create_line(p[0], p[1], q[0], q[1],
-                   tags=(tag, 'row'), width=width)
-    cv.create_line(q[0], q[1], r[0], r[1],
-                   tags=(tag, 'tri'), width=width)
-    cv.create_line(r[0], r[1], p[0], p[1],
-                   tags=(tag, 'tri'), width=width)
-    draw_point(cv, *r, colour, tag)
\ No newline at end of file
+def flatten(points):
+    """[(x0,y0), (x1,y1), …] → [x0, y0, x1, y1, …] in one C-level pass,
+    the form Tk wants for multi-point items."""
+    return list(chain.from_iterable(points))
+
+def draw_triangles(cv: tk.Canvas, parent, children, tag, colour, width):
+    """Draw every triangle built on `parent` with apexes `children` as one
+    zig-zag 'tri' polyline p₀ c₀ p₁ c₁ … pₙ instead of lines per triangle.
+    The parent edges p₀…pₙ are not redrawn: they already exist as the
+    previous layer's row line (or the seed line), and in BOTH mode both
+    branches would otherwise draw the same parent row twice.
+    A BOTH branch can shrink to a single point and leave no triangles; then
+    nothing is drawn (Tk rejects a line with fewer than two points)."""
+    if len(parent) < 2 or not children:
+        return
+    zigzag = flatten(chain.from_iterable(zip(parent, children)))
+    zigzag.extend(parent[-1])
+    cv.create_line(*zigzag, tags=(tag, 'tri'), width=width)
+
+def draw_points(cv: tk.Canvas, pts, colour, tag):
+    """Paint a whole layer of dots into one PhotoImage and show it as a single
+    canvas image item tagged (tag, 'dot'), instead of one oval item per dot.
+    Returns (item, image); the caller must keep a reference to the image.
+    Returns None for an empty row, which has nothing to paint."""
+    if not pts:
+        return None
+    r = DOT_R
+    ox = int(min(x for x, _ in pts)) - r - 1
+    oy = int(min(y for _, y in pts)) - r - 1
+    w = int(max(x for x, _ in pts)) - ox + r + 2
+    h = int(max(y for _, y in pts)) - oy + r + 2
+
+    img = tk.PhotoImage(master=cv, width=w, height=h)
+    put = img.put
+    for x, y in pts:
+        cx, cy = round(x) - ox, round(y) - oy
+        for dx, dy in _DOT_RECTS:
+            put(colour, to=(cx-dx, cy-dy, cx+dx+1, cy+dy+1))
+
+    item = cv.create_image(ox, oy, image=img, anchor='nw', tags=(tag, 'dot'))
+    return item, img
@@ -2,76 +2,129 @@
 
 import os
 import io
+import math
 import tkinter as tk
 from tkinter import messagebox, simpledialog, filedialog
 
+import drawing as drw
+
 try:
-    from PIL import Image
+    from PIL import Image, ImageDraw
 except ImportError:
-    Image = None
+    Image = ImageDraw = None
+
+# SVG element templates, filled with %-formatting straight into one buffer
+# rather than building an svgwrite element object per shape
+_SVG_HEAD = ('<?xml version="1.0" encoding="utf-8" ?>\n'
+             '<svg xmlns="http://www.w3.org/2000/svg" version="1.1" '
+             'width="%.2f" height="%.2f" viewBox="0 0 %.2f %.2f">\n')
+_SVG_CIRCLE = '<circle cx="%.2f" cy="%.2f" r="%g" fill="%s" stroke="none" />\n'
+_SVG_LINE = ('<line x1="%.2f" y1="%.2f" x2="%.2f" y2="%.2f" '
+             'stroke="#000" stroke-width="%d" />\n')
+_SVG_POLYLINE = ('<polyline points="%s" fill="none" '
+                 'stroke="#000" stroke-width="%d" />\n')
+_SVG_TAIL = '</svg>\n'
+
+
+def _visible_shapes(cv: tk.Canvas, dot_sprites, items=None):
+    """
+    One pass over the canvas: fetch each visible item's type and coords once.
+    Returns (shapes, (min_x, min_y, max_x, max_y)) where shapes lists
+    (item, type, coords) in stacking order, with type 'dots' for batched dot
+    sprites; the bbox includes a 10px margin. Returns (shapes, None) when
+    nothing is visible. `items` are the ids of the visible items when the
+    caller already knows them; otherwise each item's state is queried.
+    """
+    if items is None:
+        items = [i for i in cv.find_all() if cv.itemcget(i, 'state') != 'hidden']
+    shapes = []   # (item, type, coords) of every visible item
+    # Per-item extremes, reduced once at the end, instead of growing one list
+    # holding every coordinate of the scene
+    min_xs, min_ys, max_xs, max_ys = [], [], [], []
+    for item in items:
+        if item in dot_sprites:
+            pts = dot_sprites[item][1]
+            xs = [x for x, _ in pts]
+            ys = [y for _, y in pts]
+            shapes.append((item, 'dots', None))
+        else:
+            coords = list(map(float, cv.coords(item)))
+            xs = coords[0::2]
+            ys = coords[1::2]
+            shapes.append((item, cv.type(item), coords))
+        min_xs.append(min(xs)); max_xs.append(max(xs))
+        min_ys.append(min(ys)); max_ys.append(max(ys))
+
+    if not shapes:
+        return shapes, None
 
-def export_svg(canvas: tk.Canvas, line_thickness_var: tk.IntVar, path: str):
+    margin = 10
+    return shapes, (min(min_xs) - margin, min(min_ys) - margin,
+                    max(max_xs) + margin, max(max_ys) + margin)
+
+
+def export_svg(canvas: tk.Canvas, line_thickness_var: tk.IntVar, path: str,
+               dot_sprites=None, items=None):
     """
     Export only *visible* canvas items to SVG, preserving current line thickness
-    for <line> elements.
+    for <line> elements. `dot_sprites` maps batched dot image items to their
+    (image, points, colour) so each dot is written as a <circle>, and `items`
+    optionally lists the visible item ids (see CanvasManager.visible_items).
+    The document is written as text from fixed templates, so svgwrite is not
+    needed.
     """
-    try:
-        import svgwrite
-    except ImportError:
-        messagebox.showerror('Export', 'svgwrite not installed')
-        return
-
+    dot_sprites = dot_sprites or {}
     cv = canvas
-    visible = [i for i in cv.find_all() if cv.itemcget(i, 'state') != 'hidden']
-    if not visible:
+    shapes, bbox = _visible_shapes(cv, dot_sprites, items)
+    if bbox is None:
         messagebox.showinfo('Export', 'Nothing visible to export')
         return
-
-    xs, ys = [], []
-    for item in visible:
-        coords = list(map(float, cv.coords(item)))
-        xs.extend(coords[0::2]); ys.extend(coords[1::2])
-
-    margin = 10
-    min_x = min(xs) - margin
-    min_y = min(ys) - margin
-    max_x = max(xs) + margin
-    max_y = max(ys) + margin
+    min_x, min_y, max_x, max_y = bbox
 
     width = max_x - min_x
     height = max_y - min_y
-    shift = lambda v, off: v - off
-
-    dwg = svgwrite.Drawing(path, size=(width, height))
     lw = line_thickness_var.get()
 
-    for item in visible:
-        typ = cv.type(item)
-        coords = list(map(float, cv.coords(item)))
+    buf = io.StringIO()
+    write = buf.write
+    write(_SVG_HEAD % (width, height, width, height))
 
-        if typ == 'oval':
+    for item, typ, coords in shapes:
+        if typ == 'dots':
+            _, pts, fillcol = dot_sprites[item]
+            for x, y in pts:
+                write(_SVG_CIRCLE % (x - min_x, y - min_y, drw.DOT_R, fillcol))
+
+        elif typ == 'oval':
             x1, y1, x2, y2 = coords
-            cx = shift((x1 + x2)/2, min_x)
-            cy = shift((y1 + y2)/2, min_y)
+            cx = (x1 + x2)/2 - min_x
+            cy = (y1 + y2)/2 - min_y
             r = (x2 - x1)/2
             fillcol = cv.itemcget(item, 'fill')
-            dwg.add(dwg.circle(center=(cx, cy), r=r, fill=fillcol, stroke='none'))
+            write(_SVG_CIRCLE % (cx, cy, r, fillcol))
 
-        elif typ == 'line':
+        elif typ == 'line' and len(coords) == 4:
             x1, y1, x2, y2 = coords
-            dwg.add(dwg.line(
-                start=(shift(x1, min_x), shift(y1, min_y)),
-                end  =(shift(x2, min_x), shift(y2, min_y)),
-                stroke='#000', stroke_width=lw
-            ))
+            write(_SVG_LINE % (x1 - min_x, y1 - min_y, x2 - min_x, y2 - min_y, lw))
+
+        elif typ == 'line':
+            # batched multi-point line (one per layer/edge type)
+            pts = ' '.join('%.2f,%.2f' % (x - min_x, y - min_y)
+                           for x, y in zip(coords[0::2], coords[1::2]))
+            write(_SVG_POLYLINE % (pts, lw))
 
-    dwg.save()
+    write(_SVG_TAIL)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(buf.getvalue())
 
 
-def export_png(canvas: tk.Canvas, path: str):
+def export_png(canvas: tk.Canvas, line_thickness_var: tk.IntVar, path: str,
+               dot_sprites=None, items=None):
     """
-    Export only *visible* canvas items to PNG. Temporarily disable hidden items to
-    get a clean PostScript snapshot.
+    Export only *visible* canvas items to PNG, covering the same area as the
+    SVG export. The items are rasterized straight into a Pillow image at the
+    chosen scale, so there is no PostScript snapshot to render and parse and
+    no resize afterwards.
     """
     if Image is None:
         messagebox.showerror('Export', 'Pillow required')
@@ -81,19 +134,41 @@ def export_png(canvas: tk.Canvas, path: str):
     if not scale:
         return
 
+    dot_sprites = dot_sprites or {}
     cv = canvas
-    hidden = [i for i in cv.find_all() if cv.itemcget(i, 'state') == 'hidden']
-    for i in hidden:
-        cv.itemconfigure(i, state='disabled')
+    shapes, bbox = _visible_shapes(cv, dot_sprites, items)
+    if bbox is None:
+        messagebox.showinfo('Export', 'Nothing visible to export')
+        return
+    min_x, min_y, max_x, max_y = bbox
+
+    size = (math.ceil((max_x - min_x) * scale), math.ceil((max_y - min_y) * scale))
+    img = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(img)
+    lw = line_thickness_var.get() * scale
 
-    ps = cv.postscript(colormode='color')
-    for i in hidden:
-        cv.itemconfigure(i, state='hidden')
+    def px(x, y):
+        return (x - min_x) * scale, (y - min_y) * scale
 
-    img = Image.open(io.BytesIO(ps.encode('utf-8')))
-    w, h = img.size
-    img = img.resize((w * scale, h * scale), Image.ANTIALIAS)
-    img.save(path)
+    for item, typ, coords in shapes:
+        if typ == 'dots':
+            _, pts, fillcol = dot_sprites[item]
+            r = drw.DOT_R * scale
+            for x, y in pts:
+                cx, cy = px(x, y)
+                draw.ellipse((cx - r, cy - r, cx + r, cy + r), fill=fillcol)
+
+        elif typ == 'oval':
+            draw.ellipse(px(*coords[:2]) + px(*coords[2:]),
+                         fill=cv.itemcget(item, 'fill'))
+
+        elif typ == 'line':
+            draw.line([px(x, y) for x, y in zip(coords[0::2], coords[1::2])],
+                      fill='black', width=lw, joint='curve')
+
+    # PNG's default zlib level is slow for large images and gains little on
+    # flat line art
+    img.save(path, compress_level=1)
 
 
 def export_obj(canvas_mgr, filepath):
@@ -107,41 +182,39 @@ def export_obj(canvas_mgr, filepath):
     undo/redo has no lingering stale vertices or faces.
     """
 
-    # 1) Build a fresh vertex→index map and a flat list of unique vertices
-    vert_map = {}     # dict: (x,y,z) → OBJ_index (1-based)
+    # 1) Build a fresh vertex→index map, the unique vertices and the faces in
+    #    one pass. Vertices are keyed at the precision they are written with
+    #    (6 decimals), so points that only differ by floating-point noise (the
+    #    same apex reached from two different parent edges) become a single
+    #    shared vertex instead of two coincident ones.
+    vert_map = {}     # dict: rounded (x,y,z) → OBJ_index (1-based)
     vertices = []     # list of (x,y,z) in the order we first see them
+    faces = []        # list of (i1,i2,i3) OBJ indices
 
     for tri in canvas_mgr.triangles_3d:
+        face = []
         for v in tri:
-            if v not in vert_map:
-                # First time seeing this vertex tuple, assign next OBJ index
-                vert_map[v] = len(vertices) + 1   # OBJ indices are 1-based
+            key = (round(v[0], 6), round(v[1], 6), round(v[2], 6))
+            idx = vert_map.get(key)
+            if idx is None:
+                # First time seeing this vertex, assign next OBJ index
+                idx = vert_map[key] = len(vertices) + 1   # OBJ indices are 1-based
                 vertices.append(v)
+            face.append(idx)
+        faces.append(tuple(face))
+
+    # 2) Format the whole file in memory and write it with a single call,
+    #    instead of one f.write per vertex and per face
+    parts = ["# Triangular Growth OBJ\n",
+             "# vertex count: {}\n".format(len(vertices)),
+             "# face count: {}\n\n".format(len(faces))]
+    parts.extend("v %.6f %.6f %.6f\n" % v for v in vertices)
+    parts.append("\n")
+    parts.extend("f %d %d %d\n" % f for f in faces)
 
-    # 2) Build a flat list of faces (using the new indexing scheme)
-    faces = []
-    for tri in canvas_mgr.triangles_3d:
-        # tri is ((x1,y1,z1), (x2,y2,z2), (x3,y3,z3))
-        idx1 = vert_map[tri[0]]
-        idx2 = vert_map[tri[1]]
-        idx3 = vert_map[tri[2]]
-        faces.append((idx1, idx2, idx3))
-
-    # 3) Write out the .obj file
     try:
         with open(filepath, 'w') as f:
-            f.write("# Triangular Growth OBJ\n")
-            f.write("# vertex count: {}\n".format(len(vertices)))
-            f.write("# face count: {}\n\n".format(len(faces)))
-
-            # Write vertices
-            for (x, y, z) in vertices:
-                f.write("v {:.6f} {:.6f} {:.6f}\n".format(x, y, z))
-            f.write("\n")
-
-            # Write faces
-            for (i1, i2, i3) in faces:
-                f.write("f {} {} {}\n".format(i1, i2, i3))
+            f.write("".join(parts))
 
         print(f"Exported OBJ successfully to: {filepath}")
     except Exception as e:
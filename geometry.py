@@ -1,11 +1,55 @@
-from math import sin, cos, radians
+from itertools import pairwise
+from math import sqrt
+
+# Rotation by ±60° never changes, so its coefficients are computed once here
+# instead of calling radians/cos/sin for every segment.
+COS60 = 0.5
+SIN60 = sqrt(3) / 2
 
 def third_vertex(p, q, side):
     """Return the third vertex of an equilateral triangle built on pq.
        side = +1 (left) or –1 (right)."""
+    s = SIN60 if side > 0 else -SIN60
     vx, vy = q[0]-p[0], q[1]-p[1]
-    a = radians(60) * side
-    rx = vx * cos(a) - vy * sin(a)
-    ry = vx * sin(a) + vy * cos(a)
-    return (p[0] + rx, p[1] + ry)
+    return (p[0] + COS60*vx - s*vy, p[1] + s*vx + COS60*vy)
+
+def points_bbox(pts):
+    """(min_x, min_y, max_x, max_y) of a non-empty list of 2D points."""
+    xs = [x for x, _ in pts]
+    ys = [y for _, y in pts]
+    return min(xs), min(ys), max(xs), max(ys)
+
+def third_vertices(row, side):
+    """Third vertices for every consecutive pair of row, computed in one pass.
+       Returns a list of len(row)-1 points."""
+    s = SIN60 if side > 0 else -SIN60
+    c = COS60
+    out = []
+    for (px, py), (qx, qy) in pairwise(row):
+        vx, vy = qx-px, qy-py
+        out.append((px + c*vx - s*vy, py + s*vx + c*vy))
+    return out
+
+# Hull edge keys are plain ints: a vertex snapped to whole pixels packs into
+# one int (both coordinates offset so negative pixels stay non-negative) and
+# an undirected edge packs its two vertex keys into one int (see edge_key).
+_VOFF = 1 << 31
+_VMASK = (1 << 32) - 1
+_EDGE_MASK = (1 << 64) - 1
+
+def vertex_key(x, y):
+    """Pack a point, snapped to whole pixels, into one int."""
+    return ((round(x) + _VOFF) << 32) | (round(y) + _VOFF)
+
+def vertex_point(k):
+    """Unpack a vertex_key back into its (x, y) pixel."""
+    return (k >> 32) - _VOFF, (k & _VMASK) - _VOFF
+
+def edge_key(a, b):
+    """Pack the undirected edge between vertex keys a and b into one int,
+       the smaller key high, so (a, b) and (b, a) give the same key."""
+    return (a << 64) | b if a <= b else (b << 64) | a
 
+def edge_ends(e):
+    """Unpack an edge_key into its two vertex keys, smaller first."""
+    return e >> 64, e & _EDGE_MASK
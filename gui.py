@@ -2,15 +2,13 @@
 
 import tkinter as tk
 from tkinter import filedialog, simpledialog, messagebox
-import io, os
-
-try:
-    from PIL import Image
-except ImportError:
-    Image = None
+import os
+from collections import Counter
+from itertools import pairwise
 
 import geometry as gm
 import drawing as drw
+import exporter
 from state import LayerState
 
 # You can tweak this to control the “height” of each 3D layer:
@@ -69,6 +67,7 @@ class TriGrowthGUI:
         # Line thickness control
         tk.Label(ctrl, text='Line Thickness', font=('Arial', 10, 'bold')).pack(pady=(10, 0))
         self.line_thickness = tk.IntVar(value=1)
+        self._last_thickness = 1             # width last applied to existing lines
         tk.Spinbox(ctrl, from_=1, to=10, textvariable=self.line_thickness,
                    command=self.update_thickness, width=5).pack(anchor='w', pady=(0, 10))
 
@@ -77,6 +76,20 @@ class TriGrowthGUI:
         # Each layer in 2D: state.rows. We also keep:
         self.layers_3d = []        # list of lists of (x,y,z) for each layer
         self.triangles_3d = []     # list of ( (x1,y1,z1),(x2,y2,z2),(x3,y3,z3) ) triplets
+        self.tri_edges = {}        # layer tag -> its 'tri' edges, snapped to whole pixels
+        self.edge_cnt = Counter()  # edge -> number of live triangles using it
+        self._suspend_hull = False # set by auto_run to refresh once at the end
+        self._seed_line = None     # the one polyline item through all seed dots
+        self._hull_pending = False # an update_hull is already queued for idle time
+        self._redo_3d = []         # (row3d, triangles) of each undone layer, for redo
+        self._layer_tri_counts = []  # triangles added by each live layer, in order
+        self._vis = {}             # last state applied per channel ('dot','row','tri','hull')
+        self._layer_bbox = {}      # layer tag -> bbox of its row, for the scrollregion
+        self._hull_key = None      # boundary edges the drawn 'hull' lines were built from
+        self._hull_lines = []      # 'hull' polyline items, one per loop, reused across refreshes
+        # Per-layer dot images: canvas item -> (PhotoImage, points, colour);
+        # holding the PhotoImage here keeps Tk from discarding it
+        self.dot_sprites = {}
 
         self._drag_i = None
         self._drag_id = None
@@ -99,7 +112,8 @@ class TriGrowthGUI:
 
         # Check if clicking on an existing seed dot
         for i, (px, py) in enumerate(self.state.rows[0]):
-            if (x - px)**2 + (y - py)**2 <= (drw.DOT_R * 3)**2:
+            dx, dy = x - px, y - py
+            if dx*dx + dy*dy <= drw.HIT_R2:
                 self._drag_i = i
                 self._drag_id = self.cv.find_closest(px, py)[0]
                 return
@@ -107,13 +121,15 @@ class TriGrowthGUI:
         # Otherwise add a brand-new seed dot
         self.state.rows[0].append((x, y))
         drw.draw_point(self.cv, x, y, 'black', 'seed')
-        if len(self.state.rows[0]) > 1:
-            p, q = self.state.rows[0][-2], self.state.rows[0][-1]
-            self.cv.create_line(p[0], p[1], q[0], q[1],
-                                tags=('seed', 'row'),
-                                width=self.line_thickness.get())
+        # The seed line is one polyline through all seeds: extend it in place
+        if self._seed_line is not None:
+            self.cv.coords(self._seed_line, *drw.flatten(self.state.rows[0]))
+        elif len(self.state.rows[0]) > 1:
+            self._seed_line = self.cv.create_line(
+                *drw.flatten(self.state.rows[0]),
+                tags=('seed', 'row'), width=self.line_thickness.get())
 
-        self.update_hull()
+        self._schedule_hull()
 
     def on_drag(self, e):
         if self._drag_i is None:
@@ -121,19 +137,14 @@ class TriGrowthGUI:
         x = self.cv.canvasx(e.x)
         y = self.cv.canvasy(e.y)
         self.state.rows[0][self._drag_i] = (x, y)
-        self.cv.coords(self._drag_id,
-                       x - drw.DOT_R, y - drw.DOT_R,
-                       x + drw.DOT_R, y + drw.DOT_R)
-
-        # Redraw the “seed line” that connects seed dots
-        self.cv.delete('seed_line')
-        for i in range(len(self.state.rows[0]) - 1):
-            p, q = self.state.rows[0][i], self.state.rows[0][i+1]
-            self.cv.create_line(p[0], p[1], q[0], q[1],
-                                tags=('seed_line', 'row'),
-                                width=self.line_thickness.get())
+        r = drw.DOT_R
+        self.cv.coords(self._drag_id, x - r, y - r, x + r, y + r)
 
-        self.update_hull()
+        # Reshape the “seed line” that connects seed dots
+        if self._seed_line is not None:
+            self.cv.coords(self._seed_line, *drw.flatten(self.state.rows[0]))
+
+        self._schedule_hull()
 
     def on_release(self, _):
         self._drag_i = self._drag_id = None
@@ -150,6 +161,15 @@ class TriGrowthGUI:
         colour = drw.layer_colour(idx)
         w = self.line_thickness.get()
         z = idx * HEIGHT_STEP                # assign a Z‐height for this new layer
+        if self.state.redo:
+            # A new layer kills the redo branch: delete the undone layers'
+            # items so the reused tag only ever names the live layer
+            for item in self.cv.find_withtag('undone'):
+                self.dot_sprites.pop(item, None)
+            self.cv.delete('undone')
+            self.state.undone.clear()
+        self.tri_edges[tag] = []             # drops the edges of an undone layer with this tag
+        n_tris = len(self.triangles_3d)      # the layer's faces are appended after these
 
         # Build the new layer in 2D + record its 3D points
         if self.side.get() == 'BOTH':
@@ -161,21 +181,35 @@ class TriGrowthGUI:
             nr_2d = self._make_next(self.state.right_branch, -1, tag, colour, w, z)
             self.state.left_branch, self.state.right_branch = nl_2d, nr_2d
             new_row_2d = nl_2d + nr_2d
+            seam = len(nl_2d)
         else:
             sign = +1 if self.side.get() == 'LEFT' else -1
-            new_row_2d = self._make_next(self.state.rows[-1], sign, tag, colour, w, z)
+            parent = self.state.rows[-1]
+            # Parent edges are the previous row line; only the join between
+            # the two branches of a BOTH row was never drawn
+            if self.state.seams and self.state.seams[-1]:
+                a, b = parent[self.state.seams[-1]-1], parent[self.state.seams[-1]]
+                self.cv.create_line(a[0], a[1], b[0], b[1],
+                                    tags=(tag, 'row'), width=w)
+            new_row_2d = self._make_next(parent, sign, tag, colour, w, z)
             self.state.left_branch = self.state.right_branch = None
+            seam = None
 
-        # Push the new 2D row into state
-        self.state.push(new_row_2d, tag)
+        # Push the new 2D row into state (this drops the redo branch)
+        self.state.push(new_row_2d, tag, seam)
+        self._redo_3d.clear()
+        self._layer_tri_counts.append(len(self.triangles_3d) - n_tris)
+        # an empty row (both BOTH branches used up) has no extent
+        self._layer_bbox[tag] = gm.points_bbox(new_row_2d) if new_row_2d else None
 
         # Record the 3D geometry for this entire new row
         # seed‐row (layer=0) was already recorded at CLEAR; now we record layer idx
         new_row_3d = [(x, y, z) for (x, y) in new_row_2d]
         self.layers_3d.append(new_row_3d)
 
-        self.update_hull()
-        self.update_visibility()
+        if not self._suspend_hull:
+            self._schedule_hull()
+            self.update_visibility()
 
     def _make_next(self, row_2d, side, tag, colour, width, z):
         """
@@ -186,27 +220,38 @@ class TriGrowthGUI:
         width: current line thickness
         z:  the Z‐height for this layer (float)
         """
-        children_2d = []
-        for i in range(len(row_2d) - 1):
-            p2d, q2d = row_2d[i], row_2d[i+1]
-            # Compute the new 2D child (third vertex of equilateral)
-            c2d = gm.third_vertex(p2d, q2d, side)
-            children_2d.append(c2d)
-
-            # DRAW in 2D on the canvas:
-            drw.draw_triangle(self.cv, p2d, q2d, c2d, tag, colour, width)
-
-            # RECORD the triangle in 3D
-            # The parent edge (p2d→q2d) lives at the same z, as does c2d
-            p3d = (p2d[0], p2d[1], z)
-            q3d = (q2d[0], q2d[1], z)
-            c3d = (c2d[0], c2d[1], z)
-            self.triangles_3d.append((p3d, q3d, c3d))
+        # Compute every new 2D child (third vertex of equilateral) in one pass
+        children_2d = gm.third_vertices(row_2d, side)
+
+        # DRAW in 2D on the canvas: the whole row of triangles as one zig-zag
+        # 'tri' polyline, plus the new dots as one image item
+        drw.draw_triangles(self.cv, row_2d, children_2d, tag, colour, width)
+        # (a BOTH branch that has shrunk to one point has no new dots)
+        if children_2d:
+            item, img = drw.draw_points(self.cv, children_2d, colour, tag)
+            self.dot_sprites[item] = (img, children_2d, colour)
+        # Keep the zig-zag edges for update_hull, snapped as the canvas shows
+        # them and packed into int keys (see geometry.vertex_key/edge_key)
+        snap = [gm.vertex_key(x, y) for x, y in row_2d]
+        tips = [gm.vertex_key(x, y) for x, y in children_2d]
+        edge_key = gm.edge_key
+        keys = [edge_key(a, b)
+                for (p, q), c in zip(pairwise(snap), tips)
+                for a, b in ((p, c), (c, q))]
+        self.tri_edges[tag].extend(keys)
+        self.edge_cnt.update(keys)
+
+        # RECORD the triangles in 3D
+        # The parent edge (p2d→q2d) lives at the same z, as does c2d. Each
+        # parent point is lifted once and shared by the two triangles that
+        # use it, and the faces are appended with a single extend.
+        row_3d = [(x, y, z) for x, y in row_2d]
+        children_3d = [(x, y, z) for x, y in children_2d]
+        self.triangles_3d.extend(zip(row_3d, row_3d[1:], children_3d))
 
         # Draw the 2D “row line” connecting consecutive children_2d
-        for i in range(len(children_2d) - 1):
-            a, b = children_2d[i], children_2d[i+1]
-            self.cv.create_line(a[0], a[1], b[0], b[1],
+        if len(children_2d) > 1:
+            self.cv.create_line(*drw.flatten(children_2d),
                                 tags=(tag, 'row'),
                                 width=width)
 
@@ -216,175 +261,239 @@ class TriGrowthGUI:
         tag = self.state.pop()
         if tag:
             self.cv.itemconfigure(tag, state='hidden')
+            self.cv.addtag_withtag('undone', tag)
             self.state.undone.add(tag)
-            # Also drop the last 3D layer & its triangles:
-            if self.layers_3d:
-                self.layers_3d.pop()
-            # Remove all triangles whose Z = that layer's height
-            z_to_remove = len(self.layers_3d) * HEIGHT_STEP
-            self.triangles_3d = [
-                tri for tri in self.triangles_3d if tri[0][2] != z_to_remove
-            ]
-            self.update_hull()
+            # Take the layer's edges out of the hull counts (kept for redo)
+            cnt = self.edge_cnt
+            for key in self.tri_edges.get(tag, ()):
+                if cnt[key] == 1:
+                    del cnt[key]
+                else:
+                    cnt[key] -= 1
+            # Also drop the last 3D layer & its triangles, stashing both so
+            # redo can put them back as they were:
+            row3d = self.layers_3d.pop() if self.layers_3d else None
+            # The layer's triangles are the last ones appended: cut the tail
+            # rather than filtering the whole list by z
+            n = self._layer_tri_counts.pop()
+            removed = self.triangles_3d[len(self.triangles_3d) - n:]
+            del self.triangles_3d[len(self.triangles_3d) - n:]
+            self._redo_3d.append((row3d, removed))
+            self._schedule_hull()
             self.update_visibility()
 
     def redo_layer(self):
         tag = self.state.redo_layer()
         if tag:
             self.state.undone.discard(tag)
+            self.cv.dtag(tag, 'undone')
             self.cv.itemconfigure(tag, state='normal')
-            # We cannot “reconstruct” the 3D layer easily here unless we kept it in a redo‐stack as well.
-            # Easiest approach: when undoing, we popped one layer from layers_3d; when redoing,
-            # we need to reconstruct that layer_3d from the 2D row (state.rows[-1]) and its index.
-            idx = len(self.state.tags) - 1   # index of the re-pushed layer
-            z = idx * HEIGHT_STEP
-            row2d = self.state.rows[-1]
-            row3d = [(x, y, z) for (x, y) in row2d]
-            self.layers_3d.append(row3d)
-
-            # Triangles: we know that “redo” re-executes exactly the same equilateral
-            # construction that we had ran originally, so we can just reconstruct all triangles
-            # in the last layer from state.rows[-2] → state.rows[-1].
-            # (Note: this works because redo only follows an immediate undo.)
-            parent_row = self.state.rows[-2]
-            children = row2d
-            side = +1 if self.side.get() == 'LEFT' else -1
-            if self.side.get() == 'BOTH':
-                # BOTH‐mode: the left and right branches were stored in state,
-                # but since we only popped one generation, we know how to rebuild.
-                # Simplest: re-run _make_next on a copy of the previous left/right branch:
-                # (But for clarity, we will just recalc from 2D: identical result.)
-                # In most normal use-cases, users undo/redo only one step, so this suffices.
-                side = +1  # build a left‐only version, then append right
-                # left branch:
-                left3d = []
-                for i in range(len(parent_row) - 1):
-                    p2d, q2d = parent_row[i], parent_row[i+1]
-                    c2d = gm.third_vertex(p2d, q2d, +1)
-                    p3d = (p2d[0], p2d[1], z)
-                    q3d = (q2d[0], q2d[1], z)
-                    c3d = (c2d[0], c2d[1], z)
-                    left3d.append(c3d)
-                    self.triangles_3d.append((p3d, q3d, c3d))
-                # right branch:
-                for i in range(len(parent_row) - 1):
-                    p2d, q2d = parent_row[i], parent_row[i+1]
-                    c2d = gm.third_vertex(p2d, q2d, -1)
-                    p3d = (p2d[0], p2d[1], z)
-                    q3d = (q2d[0], q2d[1], z)
-                    c3d = (c2d[0], c2d[1], z)
-                    self.triangles_3d.append((p3d, q3d, c3d))
-                # done
-            else:
-                # single‐side redo:
-                for i in range(len(parent_row) - 1):
-                    p2d, q2d = parent_row[i], parent_row[i+1]
-                    c2d = gm.third_vertex(p2d, q2d, side)
-                    p3d = (p2d[0], p2d[1], z)
-                    q3d = (q2d[0], q2d[1], z)
-                    c3d = (c2d[0], c2d[1], z)
-                    self.triangles_3d.append((p3d, q3d, c3d))
-
-            self.update_hull()
+            self.edge_cnt.update(self.tri_edges.get(tag, ()))
+            # Restore the 3D row and triangles stashed by undo_layer, instead
+            # of rebuilding them from the 2D rows
+            row3d, tris = self._redo_3d.pop()
+            if row3d is not None:
+                self.layers_3d.append(row3d)
+            self.triangles_3d.extend(tris)
+            self._layer_tri_counts.append(len(tris))
+
+            self._schedule_hull()
             self.update_visibility()
 
     def auto_run(self):
         if self.side.get() == 'BOTH':
             return
-        while self.state.rows and len(self.state.rows[-1]) > 2:
-            self.add_layer()
+        # Only the final state matters: build every layer, then rebuild the
+        # hull and re-apply visibility once
+        self._suspend_hull = True
+        try:
+            while self.state.rows and len(self.state.rows[-1]) > 2:
+                self.add_layer()
+        finally:
+            self._suspend_hull = False
+            self.update_hull()
+            self.update_visibility()
 
     def clear(self):
         self.cv.delete('all')
+        self._seed_line = None
         self.state = LayerState()
         self.layers_3d.clear()
         self.triangles_3d.clear()
+        self.tri_edges.clear()
+        self.edge_cnt.clear()
+        self._redo_3d.clear()
+        self._layer_tri_counts.clear()
+        self._layer_bbox.clear()
+        self.dot_sprites.clear()
+        self._hull_key = None
+        self._hull_lines.clear()
         # Reset scrollregion
         self.cv.configure(scrollregion=(0, 0, 1000, 700))
         self.update_hull()
 
     # ------------------------------------------------ visibility & thickness
     def update_visibility(self):
+        # New items are created visible, so a channel that is shown and was
+        # already shown needs no itemconfigure; hidden channels are always
+        # re-applied to catch fresh items. Undone layers all carry 'undone'
+        # and only need re-hiding after some channel was switched back on.
         cv = self.cv
-        cv.itemconfigure('dot', state='normal' if self.v_dots.get() else 'hidden')
-        cv.itemconfigure('row', state='normal' if self.v_rows.get() else 'hidden')
-        cv.itemconfigure('tri', state='normal' if self.v_tris.get() else 'hidden')
-        cv.itemconfigure('hull', state='normal' if self.v_hull.get() else 'hidden')
-        for t in self.state.undone:
-            cv.itemconfigure(t, state='hidden')
+        revealed = False
+        for tag, var in (('dot',  self.v_dots),
+                         ('row',  self.v_rows),
+                         ('tri',  self.v_tris),
+                         ('hull', self.v_hull)):
+            state = 'normal' if var.get() else 'hidden'
+            if state == 'normal' and self._vis.get(tag) == 'normal':
+                continue
+            self._vis[tag] = state
+            cv.itemconfigure(tag, state=state)
+            revealed = revealed or state == 'normal'
+        if revealed and self.state.undone:
+            cv.itemconfigure('undone', state='hidden')
+
+    def visible_items(self):
+        # Ids of every item currently shown, from one tag-expression query
+        # instead of an itemcget(state) per item: undone layers carry 'undone'
+        # and hidden channels are excluded by their tag
+        terms = ['!undone']
+        terms += ['!' + tag for tag, state in self._vis.items() if state == 'hidden']
+        return self.cv.find_withtag('&&'.join(terms))
 
     def update_thickness(self):
         w = self.line_thickness.get()
-        for tag in ('row', 'tri', 'hull'):
-            self.cv.itemconfigure(tag, width=w)
+        if w == self._last_thickness:
+            return
+        self._last_thickness = w
+        # one tag expression instead of three walks over the canvas items
+        self.cv.itemconfigure('row||tri||hull', width=w)
+
+    def _update_scrollregion(self):
+        # Union of the seed row's box and the cached boxes of the live layers,
+        # instead of cv.bbox('all'), which makes Tk walk every canvas item
+        boxes = [self._layer_bbox[t] for t in self.state.tags]
+        boxes = [b for b in boxes if b is not None]
+        if self.state.rows and self.state.rows[0]:
+            boxes.append(gm.points_bbox(self.state.rows[0]))
+        if not boxes:
+            self.cv.configure(scrollregion=(0, 0, 1000, 700))
+            return
+        # room for the dots and line ends around the outermost points
+        pad = drw.DOT_R + self.line_thickness.get()
+        self.cv.configure(scrollregion=(
+            min(b[0] for b in boxes) - pad, min(b[1] for b in boxes) - pad,
+            max(b[2] for b in boxes) + pad, max(b[3] for b in boxes) + pad
+        ))
 
     # ------------------------------------------------ true outer silhouette
-    def update_hull(self):
-        cv = self.cv
-        cv.delete('hull')
+    def _schedule_hull(self):
+        # Coalesce hull rebuilds: every click, drag step or layer change
+        # before Tk next goes idle ends up in a single update_hull
+        if not self._hull_pending:
+            self._hull_pending = True
+            self.cv.after_idle(self._idle_hull)
+
+    def _idle_hull(self):
+        self._hull_pending = False
+        self.update_hull()
 
-        # Step 1: count triangle edges (undirected)
-        edge_cnt = {}
-        for item in cv.find_withtag('tri'):
-            coords = list(map(int, map(round, cv.coords(item))))
-            p = (coords[0], coords[1])
-            q = (coords[2], coords[3])
-            key = tuple(sorted((p, q)))
-            edge_cnt[key] = edge_cnt.get(key, 0) + 1
+    def update_hull(self):
+        # Step 1: undirected edge counts of the live layers, kept up to date
+        # by _make_next / undo_layer / redo_layer instead of recounted here
+        edge_cnt = self.edge_cnt
 
         # Step 2: keep only edges that appear once → boundary
         boundary = [e for e, count in edge_cnt.items() if count == 1]
+
+        # The drawn hull is still right when the boundary has not changed
+        # (seed clicks and drags, visibility-only refreshes)
+        key = frozenset(boundary)
+        if key == self._hull_key:
+            self._update_scrollregion()
+            self.update_visibility()
+            return
+        self._hull_key = key
+
         if len(boundary) < 3:
+            self._draw_hull([])
             # Even if no hull, we still update scrollregion
-            self.cv.configure(scrollregion=self.cv.bbox('all') or (0, 0, 1000, 700))
+            self._update_scrollregion()
             self.update_visibility()
             return
 
-        # Step 3: build adjacency map
-        adj = {}
-        for p, q in boundary:
-            adj.setdefault(p, []).append(q)
-            adj.setdefault(q, []).append(p)
-
-        # Step 4: walk all loops using a visited‐edge set
-        visited = set()  # set of frozenset({p, q}) for edges we’ve drawn
+        # Step 3: build adjacency on integer ids: each boundary vertex gets an
+        # id and nbrs[id] lists its (neighbour id, edge id) pairs
+        vid = {}
+        pts = []
+        nbrs = []
+        for eid, e in enumerate(boundary):
+            p, q = gm.edge_ends(e)
+            for v in (p, q):
+                if v not in vid:
+                    vid[v] = len(pts)
+                    pts.append(v)
+                    nbrs.append([])
+            i, j = vid[p], vid[q]
+            nbrs[i].append((j, eid))
+            nbrs[j].append((i, eid))
+
+        # Step 4: walk all loops, marking edge ids in a flat list instead of
+        # hashing sorted point pairs into a visited set
+        used = [False] * len(boundary)
         loops = []
-        for start in adj:
+        for start in range(len(pts)):
             # if all edges at this vertex are already visited, skip
-            if all(tuple(sorted((start, n))) in visited for n in adj[start]):
+            if all(used[e] for _, e in nbrs[start]):
                 continue
 
             loop = [start]
-            prev, curr = None, start
+            curr = start
             while True:
                 nxt = None
-                for n in adj[curr]:
-                    key = tuple(sorted((curr, n)))
-                    if key not in visited:
+                for n, e in nbrs[curr]:
+                    if not used[e]:
+                        used[e] = True
                         nxt = n
-                        visited.add(key)
                         break
                 if nxt is None or nxt == start:
                     break
                 loop.append(nxt)
-                prev, curr = curr, nxt
+                curr = nxt
 
-            if len(loop) > 2:
+            # Only close chains that really return to their start; an open
+            # chain must not get a fake closing edge.
+            if nxt == start:
                 loop.append(start)
-                loops.append(loop)
+            if len(loop) > 2:
+                loops.append([gm.vertex_point(pts[i]) for i in loop])
 
-        # Step 5: draw each loop in 2D
-        w = self.line_thickness.get()
-        for loop in loops:
-            for i in range(len(loop) - 1):
-                p, q = loop[i], loop[i+1]
-                cv.create_line(p[0], p[1], q[0], q[1],
-                               tags=('hull',), width=w)
+        # Step 5: draw each loop in 2D as a single polyline
+        self._draw_hull(loops)
 
         # Step 6: update scrollregion so you can pan/zoom to see everything
-        self.cv.configure(scrollregion=self.cv.bbox('all') or (0, 0, 1000, 700))
+        self._update_scrollregion()
         self.update_visibility()
 
+    def _draw_hull(self, loops):
+        # Reuse the existing hull items: move them with cv.coords, and only
+        # create or delete the surplus when the number of loops changes
+        cv = self.cv
+        items = self._hull_lines
+        for item in items[len(loops):]:
+            cv.delete(item)
+        del items[len(loops):]
+
+        w = None
+        for k, loop in enumerate(loops):
+            flat = drw.flatten(loop)
+            if k < len(items):
+                cv.coords(items[k], *flat)
+            else:
+                if w is None:
+                    w = self.line_thickness.get()
+                items.append(cv.create_line(*flat, tags=('hull',), width=w))
+
     # ------------------------------------------------ Export dialog (svg/png/obj)
     def export_dialog(self):
         fmt = simpledialog.askstring('Export', 'Format (svg/png/obj):', initialvalue='svg')
@@ -409,109 +518,47 @@ class TriGrowthGUI:
 
     # ------------------------------------------------ Export to SVG (preserve line thickness)
     def _exp_svg(self, path):
-        try:
-            import svgwrite
-        except ImportError:
-            messagebox.showerror('Export', 'svgwrite not installed')
-            return
-
-        cv = self.cv
-        visible = [i for i in cv.find_all() if cv.itemcget(i, 'state') != 'hidden']
-        if not visible:
-            messagebox.showinfo('Export', 'Nothing visible to export')
-            return
-
-        # 1. Compute bounding box
-        xs, ys = [], []
-        for item in visible:
-            coords = list(map(float, cv.coords(item)))
-            xs.extend(coords[0::2])
-            ys.extend(coords[1::2])
-
-        margin = 10
-        min_x = min(xs) - margin
-        min_y = min(ys) - margin
-        max_x = max(xs) + margin
-        max_y = max(ys) + margin
-
-        width = max_x - min_x
-        height = max_y - min_y
-        shift = lambda v, off: v - off
-
-        dwg = svgwrite.Drawing(path, size=(width, height))
-        lw = self.line_thickness.get()
-
-        # 2. Draw visible items into SVG
-        for item in visible:
-            typ = cv.type(item)
-            coords = list(map(float, cv.coords(item)))
-
-            if typ == 'oval':
-                x1, y1, x2, y2 = coords
-                cx = shift((x1 + x2) / 2, min_x)
-                cy = shift((y1 + y2) / 2, min_y)
-                r = (x2 - x1) / 2
-                fillcol = cv.itemcget(item, 'fill')
-                dwg.add(dwg.circle(center=(cx, cy), r=r, fill=fillcol, stroke='none'))
-
-            elif typ == 'line':
-                x1, y1, x2, y2 = coords
-                dwg.add(dwg.line(start=(shift(x1, min_x), shift(y1, min_y)),
-                                 end  =(shift(x2, min_x), shift(y2, min_y)),
-                                 stroke='#000', stroke_width=lw))
-
-        dwg.save()
+        # Same text-template writer as the main window: visible items only,
+        # lines at the current thickness, polylines kept as <polyline>
+        exporter.export_svg(self.cv, self.line_thickness, path, self.dot_sprites,
+                            self.visible_items())
 
     # ------------------------------------------------ Export to PNG (visible only)
     def _exp_png(self, path):
-        if Image is None:
-            messagebox.showerror('Export', 'Pillow required')
-            return
-        scale = simpledialog.askinteger('PNG scale', 'Scale (1–10)',
-                                        initialvalue=1, minvalue=1, maxvalue=10)
-        if not scale:
-            return
-
-        cv = self.cv
-        hidden = [i for i in cv.find_all() if cv.itemcget(i, 'state') == 'hidden']
-        for i in hidden:
-            cv.itemconfigure(i, state='disabled')
-
-        ps = cv.postscript(colormode='color')
-        for i in hidden:
-            cv.itemconfigure(i, state='hidden')
-
-        img = Image.open(io.BytesIO(ps.encode('utf-8')))
-        w, h = img.size
-        img = img.resize((w * scale, h * scale), Image.ANTIALIAS)
-        img.save(path)
+        # Rasterized straight into a Pillow image by the shared exporter, with
+        # no PostScript snapshot, Ghostscript decode or resize pass
+        exporter.export_png(self.cv, self.line_thickness, path, self.dot_sprites,
+                            self.visible_items())
 
     # ------------------------------------------------ Export to OBJ (3D model)
     def _exp_obj(self, path):
-        # We will write each triangle’s three vertices as separate 'v' lines,
-        # then each triangle as an 'f' face. This means no vertex sharing, but
-        # it’s the simplest approach.
+        # Each distinct (x,y,z) is written once as a 'v' line and every
+        # triangle becomes an 'f' face over those shared indices.
 
         if not self.triangles_3d:
             messagebox.showinfo('Export', 'No 3D data to export. Add at least one layer.')
             return
 
-        # Flatten vertices and assign indices 1-based
-        vertices = []
-        faces = []
+        # Neighbouring triangles share their parent-row vertices exactly, so a
+        # vertex → index map collapses the repeats in the same pass that
+        # formats the lines. The file is assembled in memory and written once.
+        vmap = {}
+        vert_lines = []
+        face_lines = []
         for tri in self.triangles_3d:
-            base_idx = len(vertices)  # 0-based
-            vertices.extend(tri)
-            # OBJ face indices are 1-based
-            faces.append((base_idx + 1, base_idx + 2, base_idx + 3))
+            face = []
+            for v in tri:
+                idx = vmap.get(v)
+                if idx is None:
+                    idx = vmap[v] = len(vert_lines) + 1   # OBJ indices are 1-based
+                    vert_lines.append("v %s %s %s\n" % v)
+                face.append(idx)
+            face_lines.append("f %d %d %d\n" % tuple(face))
 
         try:
             with open(path, 'w') as f:
-                f.write("# Triangular Growth 3D OBJ export\n")
-                for v in vertices:
-                    f.write(f"v {v[0]} {v[1]} {v[2]}\n")
-                for face in faces:
-                    f.write(f"f {face[0]} {face[1]} {face[2]}\n")
+                f.write("# Triangular Growth 3D OBJ export\n"
+                        + "".join(vert_lines) + "".join(face_lines))
             messagebox.showinfo('Export', f'OBJ saved to:\n{os.path.abspath(path)}')
         except Exception as e:
             messagebox.showerror('Export', f'Failed to write OBJ:\n{e}')
@@ -4,24 +4,29 @@ class LayerState:
     def __init__(self):
         self.rows = []  # list[list[(x,y)]]
         self.tags = []  # active layer tags
-        self.redo = deque()  # stack of (row, tag)
+        self.seams = []  # per layer: index where a BOTH row joins its branches
+        self.redo = deque()  # stack of (row, tag, seam)
         self.undone = set()  # ← NEW: tags currently hidden
         self.left_branch = None
         self.right_branch = None
+        self.left3d = None
+        self.right3d = None
         self.seed_locked = False
 
     # ---------- helpers ----------
-    def push(self, row, tag):
+    def push(self, row, tag, seam=None):
         self.rows.append(row)
         self.tags.append(tag)
-        self.redo.clear()       # new branch kills redo
+        self.seams.append(seam)
+        if self.redo:
+            self.redo.clear()   # new branch kills redo
 
     def pop(self):
         if len(self.rows) <= 1:
             return None
         row = self.rows.pop()
         tag = self.tags.pop()
-        self.redo.append((row, tag))
+        self.redo.append((row, tag, self.seams.pop()))
         if len(self.rows) == 1:
             self.seed_locked = False
         return tag
@@ -29,8 +34,9 @@ class LayerState:
     def redo_layer(self):
         if not self.redo:
             return None
-        row, tag = self.redo.pop()
+        row, tag, seam = self.redo.pop()
         self.rows.append(row)
         self.tags.append(tag)
+        self.seams.append(seam)
         self.seed_locked = True
         return tag